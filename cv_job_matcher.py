@@ -5,28 +5,179 @@ Analyzes how well your CV matches a job description using Ollama
 """
 
 import ollama
+import asyncio
+import hashlib
 import json
 import os
 import re
 import argparse
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Tuple
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Pattern, Tuple
 import sys
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Prompt cache: exact matches keyed on model + prompt, plus optional matches
+# for the same CV and task whose job description embedding is close enough.
+# Least recently used responses (and their embeddings) are dropped past
+# CACHE_MAX_ENTRIES
+CACHE_FILE = Path.home() / ".cache" / "cv_matcher" / "cache.json"
+CACHE_MAX_ENTRIES = 500
+EMBED_MODEL = "nomic-embed-text"
+SEMANTIC_THRESHOLD = 0.97
+
+# Prompt budget: the context window is the model's trained context length
+# (DEFAULT_NUM_CTX if Ollama doesn't report one), capped at MAX_NUM_CTX.
+# Half of it is kept for the instructions and the reply, and the CV and job
+# text get a quarter each. cl100k_base counts fewer tokens than llama
+# tokenizers do, so text budgets are scaled down by TOKEN_MARGIN
+DEFAULT_NUM_CTX = 2048
+MAX_NUM_CTX = 4096
+TOKEN_MARGIN = 0.75
+
+# Keep models loaded between the sub-prompts of an analysis instead of
+# letting the server unload and reload them
+KEEP_ALIVE = "10m"
+
+_WORD_RE = re.compile(r'\S+')
+
+# Patterns for pulling results out of model responses
+SCORE_RE = re.compile(r'(\d+)(?:/100|%|\s*out of 100)')
+JSON_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+# How much of the tail of a streamed response is searched as chunks arrive
+STREAM_WINDOW = 64
+
+@lru_cache(maxsize=None)
+def _token_encoding():
+    """Load the tiktoken encoding used for token counting, if available"""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding('cl100k_base')
+    except Exception:
+        return None
+
+def _truncate(text: str, max_tokens: int) -> str:
+    """Trim text to roughly max_tokens tokens"""
+    encoding = _token_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+        return encoding.decode(tokens[:max_tokens])
+    
+    # Without tiktoken, assume about three words per four tokens
+    max_words = max_tokens * 3 // 4
+    for count, word in enumerate(_WORD_RE.finditer(text), 1):
+        if count == max_words:
+            return text[:word.end()]
+    return text
+
+def _parse_json(text: str):
+    """Parse JSON with orjson when available, falling back to the stdlib parser"""
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass  # stdlib json also accepts NaN and Infinity, which orjson rejects
+    return json.loads(text)
+
+def _raw(reply: str) -> str:
+    """Use a model reply as is"""
+    return reply
+
+def _parse_sections(reply: str) -> Dict[str, any]:
+    """Pull the JSON object out of a key sections reply"""
+    json_match = JSON_RE.search(reply)
+    if not json_match:
+        raise ValueError("Could not parse JSON from model response")
+    return _parse_json(json_match.group())
+
+# What each analysis reports in place of its result when it fails, in analysis order
+_FAILURE_PLACEHOLDERS = {
+    'sections': lambda e: {},
+    'match_analysis': lambda e: {"overall_score": 0, "detailed_analysis": "Analysis failed", "timestamp": datetime.now().isoformat()},
+    'cover_letter_suggestions': lambda e: f"Error generating suggestions: {e}",
+    'skill_gaps': lambda e: f"Error identifying gaps: {e}",
+}
+
+@lru_cache(maxsize=32)
+def _context(cv_text: str, job_text: str) -> str:
+    """System prompt for a CV/job pair, built once and shared by all of its analyses"""
+    return f"""You are an expert recruiter. Use the CV and job description below to answer the request that follows.
+
+CV:
+{cv_text}
+
+JOB DESCRIPTION:
+{job_text}"""
+
 class CVJobMatcher:
-    def __init__(self, model: str = "tinyllama"):
+    def __init__(self, model: str = "tinyllama", use_cache: bool = True, semantic_cache: bool = False,
+                 host: Optional[str] = None, client_options: Optional[Dict[str, any]] = None,
+                 client: Optional[ollama.Client] = None, aclient: Optional[ollama.AsyncClient] = None,
+                 num_parallel: int = None):
         self.model = model
+        
+        # Chat requests in flight at once, matched to the server's parallel slots
+        self.num_parallel = num_parallel or int(os.getenv('OLLAMA_NUM_PARALLEL', '4'))
+        self._chat_slots = None  # (event loop, semaphore), see _slots
         self.analysis_results = {}
         
+        # Analyses are async, so they need an AsyncClient as well; both are built
+        # from the same host and options (timeout, headers, ...) unless passed in
+        client_options = client_options or {}
+        self.client = client or ollama.Client(host=host, **client_options)
+        self.aclient = aclient or ollama.AsyncClient(host=host, **client_options)
+        self.use_cache = use_cache
+        self.semantic_cache = use_cache and semantic_cache
+        self.cache = self._load_cache() if use_cache else {}
+        self._cache_dirty = False
+        
+        if self.semantic_cache:
+            try:
+                import numpy  # noqa: F401
+            except ImportError:
+                print("⚠️ numpy not installed, semantic cache disabled. Install with: pip install numpy")
+                self.semantic_cache = False
+        
         # Test Ollama connection
         try:
-            ollama.list()
+            self.client.list()
             print(f"✅ Connected to Ollama using model: {model}")
         except Exception as e:
             print(f"❌ Cannot connect to Ollama: {e}")
             print("Make sure Ollama is running with 'ollama serve'")
             sys.exit(1)
+        
+        # Size the prompt to the model instead of asking for more context than it was trained on
+        self.num_ctx = min(self._context_length(), MAX_NUM_CTX)
+        self.max_text_tokens = int(self.num_ctx // 4 * TOKEN_MARGIN)
+    
+    def _context_length(self) -> int:
+        """The model's trained context length, or DEFAULT_NUM_CTX if Ollama doesn't report it"""
+        try:
+            info = self.client.show(self.model)
+            model_info = info.get('modelinfo') or info.get('model_info') or {}
+        except Exception:
+            return DEFAULT_NUM_CTX
+        
+        # Keyed by architecture, e.g. 'llama.context_length'
+        for key, value in model_info.items():
+            if key.endswith('.context_length') and value:
+                return int(value)
+        return DEFAULT_NUM_CTX
     
     def read_file(self, file_path: str) -> str:
         """Read text from various file formats"""
@@ -55,16 +206,34 @@ class CVJobMatcher:
     
     def _read_pdf(self, file_path: Path) -> str:
         """Extract text from PDF"""
+        try:
+            import pypdfium2 as pdfium
+        except ImportError:
+            pdfium = None
+        
+        # pypdfium2 wraps the C PDFium library and is much faster than PyPDF2
+        if pdfium is not None:
+            pdf = pdfium.PdfDocument(file_path)
+            try:
+                parts = []
+                for i in range(len(pdf)):
+                    page = pdf[i]
+                    textpage = page.get_textpage()
+                    parts.append(textpage.get_text_range())
+                    textpage.close()
+                    page.close()
+            finally:
+                pdf.close()
+            return "\n".join(parts) + "\n"
+        
         try:
             import PyPDF2
             with open(file_path, 'rb') as file:
                 reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-                return text
+                parts = [page.extract_text() for page in reader.pages]
+                return "\n".join(parts) + "\n"
         except ImportError:
-            print("⚠️ PyPDF2 not installed. Install with: pip install PyPDF2")
+            print("⚠️ No PDF library installed. Install with: pip install pypdfium2")
             raise
     
     def _read_docx(self, file_path: Path) -> str:
@@ -72,63 +241,188 @@ class CVJobMatcher:
         try:
             import docx
             doc = docx.Document(file_path)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
+            return "\n".join(paragraph.text for paragraph in doc.paragraphs) + "\n"
         except ImportError:
             print("⚠️ python-docx not installed. Install with: pip install python-docx")
             raise
     
-    def extract_key_sections(self, cv_text: str, job_text: str) -> Dict[str, str]:
+    def _load_cache(self) -> Dict[str, any]:
+        """Load the prompt cache from disk"""
+        try:
+            with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+        cache.setdefault('responses', {})
+        cache.setdefault('embeddings', [])
+        return cache
+    
+    def _save_cache(self):
+        """Write the prompt cache back to disk"""
+        try:
+            CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = CACHE_FILE.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.cache, f)
+            os.replace(tmp_file, CACHE_FILE)
+        except OSError as e:
+            print(f"⚠️ Could not save prompt cache: {e}")
+    
+    def _flush_cache(self):
+        """Trim the prompt cache to CACHE_MAX_ENTRIES and write it out, if anything was added"""
+        if not self._cache_dirty:
+            return
+        
+        # Responses are kept in use order, least recent first
+        responses = self.cache['responses']
+        if len(responses) > CACHE_MAX_ENTRIES:
+            for key in list(responses)[:len(responses) - CACHE_MAX_ENTRIES]:
+                del responses[key]
+            self.cache['embeddings'] = [e for e in self.cache['embeddings'] if e['key'] in responses]
+        
+        self._save_cache()
+        self._cache_dirty = False
+    
+    def _semantic_lookup(self, embedding: List[float], cv_hash: str, task: str):
+        """Return a cached response for this CV and task whose job description embedding is close enough, if any"""
+        import numpy as np
+        
+        entries = [e for e in self.cache['embeddings']
+                   if e['model'] == self.model and e['task'] == task and e.get('cv') == cv_hash]
+        if not entries:
+            return None
+        
+        vectors = np.array([e['vector'] for e in entries], dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        query = np.array(embedding, dtype=np.float32)
+        query /= np.linalg.norm(query)
+        
+        similarities = vectors @ query
+        best = int(np.argmax(similarities))
+        if similarities[best] >= SEMANTIC_THRESHOLD:
+            return self.cache['responses'].get(entries[best]['key'])
+        return None
+    
+    def _slots(self) -> asyncio.Semaphore:
+        """Semaphore holding chat requests to num_parallel, one per event loop"""
+        loop = asyncio.get_running_loop()
+        if self._chat_slots is None or self._chat_slots[0] is not loop:
+            self._chat_slots = (loop, asyncio.Semaphore(self.num_parallel))
+        return self._chat_slots[1]
+    
+    def _messages(self, cv_text: str, job_text: str, instructions: str) -> List[Dict[str, str]]:
+        """Build a chat request whose system message carries the CV and job description"""
+        # Every analysis sends the same system message, so Ollama can reuse the
+        # cached prompt prefix instead of re-processing both documents
+        return [
+            {'role': 'system', 'content': _context(cv_text, job_text)},
+            {'role': 'user', 'content': instructions}
+        ]
+    
+    async def _chat(self, messages: List[Dict[str, str]], watch: Optional[Pattern] = None,
+                    on_match: Optional[Callable] = None) -> str:
+        """Stream a chat response, calling on_match as soon as watch first matches"""
+        parts = []
+        tail = ""
+        async with self._slots():
+            stream = await self.aclient.chat(model=self.model, messages=messages, stream=True,
+                                           options={'num_ctx': self.num_ctx}, keep_alive=KEEP_ALIVE)
+            async for chunk in stream:
+                content = chunk['message']['content']
+                parts.append(content)
+                
+                if watch is not None:
+                    tail = (tail + content)[-STREAM_WINDOW:]
+                    match = watch.search(tail)
+                    if match:
+                        on_match(match)
+                        watch = None
+        
+        return "".join(parts)
+    
+    async def _cached_chat(self, cv_text: str, job_text: str, instructions: str, task: str,
+                           parse: Callable = _raw, watch: Optional[Pattern] = None,
+                           on_match: Optional[Callable] = None):
+        """Run a chat request and parse the reply, reusing cached replies for identical or near-identical requests"""
+        messages = self._messages(cv_text, job_text, instructions)
+        if not self.use_cache:
+            return parse(await self._chat(messages, watch, on_match))
+        
+        prompt = "\n\n".join(message['content'] for message in messages)
+        key = hashlib.sha256(f"{self.model}|{prompt}".encode()).hexdigest()
+        reply = self.cache['responses'].pop(key, None)
+        if reply is not None:
+            try:
+                result = parse(reply)
+            except ValueError:
+                self._cache_dirty = True  # unparseable reply from an older version; ask again
+            else:
+                # Put the hit back at the end so eviction drops the least recently used
+                self.cache['responses'][key] = reply
+                return result
+        
+        # Near-identical means the same CV and task with a reworded job
+        # description; only the job description is embedded, since the rest
+        # of the prompt is shared by every job and would mask the difference
+        embedding = None
+        cv_hash = hashlib.sha256(cv_text.encode()).hexdigest()
+        if self.semantic_cache:
+            try:
+                response = await self.aclient.embeddings(model=EMBED_MODEL, prompt=job_text, keep_alive=KEEP_ALIVE)
+                embedding = response['embedding']
+            except Exception as e:
+                print(f"⚠️ Could not embed job description with {EMBED_MODEL}, semantic cache disabled: {e}")
+                self.semantic_cache = False
+            
+            if embedding:
+                cached = self._semantic_lookup(embedding, cv_hash, task)
+                if cached is not None:
+                    try:
+                        return parse(cached)
+                    except ValueError:
+                        pass
+        
+        # Parsed before it is stored, so a reply that can't be used is not cached
+        reply = await self._chat(messages, watch, on_match)
+        result = parse(reply)
+        
+        self.cache['responses'][key] = reply
+        if embedding:
+            self.cache['embeddings'].append({
+                "key": key,
+                "model": self.model,
+                "task": task,
+                "cv": cv_hash,
+                "vector": embedding
+            })
+        self._cache_dirty = True  # written once per analysis or batch, not per response
+        
+        return result
+    
+    async def extract_key_sections(self, cv_text: str, job_text: str) -> Dict[str, str]:
         """Extract key sections from CV and job description"""
-        prompt = f"""
-        Analyze the following CV and Job Description. Extract the key information in JSON format.
-
-        CV:
-        {cv_text}
-
-        JOB DESCRIPTION:
-        {job_text}
+        instructions = """
+        Extract the key information from the CV and job description in JSON format.
 
         Please extract and return a JSON object with the following structure:
-        {{
+        {
             "cv_skills": ["list of skills from CV"],
             "cv_experience": ["list of relevant experience from CV"],
             "cv_education": ["education/qualifications from CV"],
             "job_requirements": ["list of required skills/qualifications from job"],
             "job_responsibilities": ["main job responsibilities"],
             "job_company": "company name if mentioned"
-        }}
+        }
 
         Only return the JSON object, nothing else.
         """
         
-        try:
-            response = ollama.generate(model=self.model, prompt=prompt)
-            result = response['response']
-            
-            # Try to extract JSON from the response
-            json_match = re.search(r'\{.*\}', result, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
-            else:
-                print("⚠️ Could not parse JSON from model response")
-                return {}
-        except Exception as e:
-            print(f"❌ Error extracting sections: {e}")
-            return {}
+        return await self._cached_chat(cv_text, job_text, instructions, 'sections', parse=_parse_sections)
     
-    def calculate_match_score(self, cv_text: str, job_text: str) -> Dict[str, any]:
+    async def calculate_match_score(self, cv_text: str, job_text: str) -> Dict[str, any]:
         """Calculate overall match score and analysis"""
-        prompt = f"""
-        You are an expert recruiter. Analyze how well this CV matches the job description.
-
-        CV:
-        {cv_text[:2000]}  # Limit to avoid token limits
-
-        JOB DESCRIPTION:
-        {job_text[:2000]}
+        instructions = """
+        Analyze how well the CV matches the job description.
 
         Provide a detailed analysis with:
         1. Overall Match Score (0-100)
@@ -140,47 +434,36 @@ class CVJobMatcher:
         Format your response clearly with sections.
         """
         
-        try:
-            response = ollama.generate(model=self.model, prompt=prompt)
-            analysis = response['response']
-            
-            # Try to extract a numerical score
-            score_match = re.search(r'(\d+)(?:/100|%|\s*out of 100)', analysis)
-            score = int(score_match.group(1)) if score_match else 0
-            
-            return {
-                "overall_score": score,
-                "detailed_analysis": analysis,
-                "timestamp": datetime.now().isoformat()
-            }
-        except Exception as e:
-            print(f"❌ Error calculating match score: {e}")
-            return {"overall_score": 0, "detailed_analysis": "Analysis failed", "timestamp": datetime.now().isoformat()}
+        # Report the score as soon as it streams in, while the rest is still generating
+        analysis = await self._cached_chat(
+            cv_text, job_text, instructions, 'match',
+            watch=SCORE_RE, on_match=lambda m: print(f"  📈 Match score: {m.group(1)}/100")
+        )
+        
+        # Try to extract a numerical score
+        score_match = SCORE_RE.search(analysis)
+        score = int(score_match.group(1)) if score_match else 0
+        
+        return {
+            "overall_score": score,
+            "detailed_analysis": analysis,
+            "timestamp": datetime.now().isoformat()
+        }
     
-    def generate_cover_letter_suggestions(self, cv_text: str, job_text: str) -> str:
+    async def generate_cover_letter_suggestions(self, cv_text: str, job_text: str) -> str:
         """Generate cover letter talking points"""
-        prompt = f"""
-        Based on this CV and job description, suggest 3-4 key talking points for a cover letter that highlight the strongest matches.
-
-        CV:
-        {cv_text[:1500]}
-
-        JOB DESCRIPTION:
-        {job_text[:1500]}
+        instructions = """
+        Based on the CV and job description, suggest 3-4 key talking points for a cover letter that highlight the strongest matches.
 
         Provide specific examples from the CV that directly relate to job requirements. Make the suggestions actionable and compelling.
         """
         
-        try:
-            response = ollama.generate(model=self.model, prompt=prompt)
-            return response['response']
-        except Exception as e:
-            return f"Error generating suggestions: {e}"
+        return await self._cached_chat(cv_text, job_text, instructions, 'cover_letter')
     
-    def identify_skill_gaps(self, cv_text: str, job_text: str) -> str:
+    async def identify_skill_gaps(self, cv_text: str, job_text: str) -> str:
         """Identify missing skills and suggest improvements"""
-        prompt = f"""
-        Compare the skills and requirements in this job description with the CV. Identify:
+        instructions = """
+        Compare the skills and requirements in the job description with the CV. Identify:
 
         1. Missing technical skills
         2. Missing soft skills  
@@ -188,27 +471,26 @@ class CVJobMatcher:
         4. Specific improvements needed
         5. Learning priorities
 
-        CV:
-        {cv_text[:1500]}
-
-        JOB DESCRIPTION:
-        {job_text[:1500]}
-
         Be specific and practical in your recommendations.
         """
         
-        try:
-            response = ollama.generate(model=self.model, prompt=prompt)
-            return response['response']
-        except Exception as e:
-            return f"Error identifying gaps: {e}"
+        return await self._cached_chat(cv_text, job_text, instructions, 'skill_gaps')
     
-    def analyze_match(self, cv_file: str, job_file: str) -> Dict[str, any]:
+    async def analyze_match(self, cv_file: str, job_file: str, save_cache: bool = True) -> Dict[str, any]:
         """Main analysis function"""
         print("📄 Reading files...")
         
         try:
             cv_text = self.read_file(cv_file)
+        except Exception as e:
+            print(f"❌ Error reading files: {e}")
+            return {}
+        
+        return await self.analyze_match_text(cv_text, job_file, save_cache)
+    
+    async def analyze_match_text(self, cv_text: str, job_file: str, save_cache: bool = True) -> Dict[str, any]:
+        """Analyze an already parsed CV against a job description file"""
+        try:
             job_text = self.read_file(job_file)
             
             print(f"✅ CV: {len(cv_text)} characters")
@@ -217,30 +499,71 @@ class CVJobMatcher:
             print(f"❌ Error reading files: {e}")
             return {}
         
-        print("\n🔍 Analyzing match...")
-        results = {}
+        # Trim both texts once to fit the prompt budget; every analysis uses the same cut
+        cv_text = _truncate(cv_text, self.max_text_tokens)
+        job_text = _truncate(job_text, self.max_text_tokens)
         
-        # 1. Extract key sections
-        print("  Extracting key information...")
-        results['sections'] = self.extract_key_sections(cv_text, job_text)
+        print("\n🔍 Analyzing match...")
         
-        # 2. Calculate match score
-        print("  Calculating match score...")
-        results['match_analysis'] = self.calculate_match_score(cv_text, job_text)
+        # The four analyses are independent, so run them concurrently
+        print("  Extracting key information, scoring, and generating suggestions...")
+        outcomes = await asyncio.gather(
+            self.extract_key_sections(cv_text, job_text),
+            self.calculate_match_score(cv_text, job_text),
+            self.generate_cover_letter_suggestions(cv_text, job_text),
+            self.identify_skill_gaps(cv_text, job_text),
+            return_exceptions=True
+        )
         
-        # 3. Generate cover letter suggestions
-        print("  Generating cover letter suggestions...")
-        results['cover_letter_suggestions'] = self.generate_cover_letter_suggestions(cv_text, job_text)
+        # A failed analysis is shown as a placeholder and listed under 'failed',
+        # so callers can tell the results are incomplete and not keep them
+        results = {}
+        failed = []
+        for key, outcome in zip(_FAILURE_PLACEHOLDERS, outcomes):
+            if isinstance(outcome, Exception):
+                print(f"❌ Error in {key.replace('_', ' ')}: {outcome}")
+                outcome = _FAILURE_PLACEHOLDERS[key](outcome)
+                failed.append(key)
+            results[key] = outcome
+        if failed:
+            results['failed'] = failed
         
-        # 4. Identify skill gaps
-        print("  Identifying skill gaps...")
-        results['skill_gaps'] = self.identify_skill_gaps(cv_text, job_text)
+        if save_cache:  # batches save once at the end instead
+            self._flush_cache()
         
         # Store for later use
         self.analysis_results = results
         
         return results
     
+    async def analyze_pairs(self, pairs: List[Tuple[str, str]],
+                            cv_texts: Optional[Dict[str, str]] = None) -> List[Dict[str, any]]:
+        """Analyze (cv_file, job_file) pairs concurrently, returning results in input order"""
+        cv_texts = cv_texts or {}  # cv_file -> already parsed text
+        
+        async def analyze_one(cv_file, job_file):
+            if cv_file in cv_texts:
+                return await self.analyze_match_text(cv_texts[cv_file], job_file, save_cache=False)
+            return await self.analyze_match(cv_file, job_file, save_cache=False)
+        
+        # Start pairs grouped by CV, as they share the prompt prefix the server
+        # caches; the sort is stable, so each CV's pairs keep their order
+        order = sorted(range(len(pairs)), key=lambda i: pairs[i][0])
+        try:
+            grouped = await asyncio.gather(*(analyze_one(*pairs[i]) for i in order))
+        finally:
+            self._flush_cache()
+        
+        results = [None] * len(pairs)
+        for i, result in zip(order, grouped):
+            results[i] = result
+        return results
+    
+    async def analyze_batch(self, cv_files: List[str], job_files: List[str]) -> List[Dict[str, any]]:
+        """Analyze every CV against every job description, CV-major"""
+        pairs = [(cv_file, job_file) for cv_file in cv_files for job_file in job_files]
+        return await self.analyze_pairs(pairs)
+    
     def generate_report(self, results: Dict[str, any], output_file: str = None) -> str:
         """Generate a formatted report"""
         if not results:
@@ -293,8 +616,12 @@ Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"cv_job_analysis_{timestamp}.json"
         
-        with open(filename, 'w') as f:
-            json.dump(self.analysis_results, f, indent=2)
+        if orjson is not None:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(self.analysis_results, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filename, 'w') as f:
+                json.dump(self.analysis_results, f, indent=2)
         
         print(f"💾 Results saved to: {filename}")
 
@@ -306,6 +633,8 @@ def main():
     parser.add_argument("--model", default="tinyllama", help="Ollama model to use")
     parser.add_argument("--output", "-o", help="Output file for report (markdown)")
     parser.add_argument("--save-json", help="Save results as JSON file")
+    parser.add_argument("--no-cache", action="store_true", help="Always query the model, ignoring cached responses")
+    parser.add_argument("--semantic-cache", action="store_true", help=f"Also reuse responses for near-identical prompts (needs numpy and the {EMBED_MODEL} model)")
     
     args = parser.parse_args()
     
@@ -313,10 +642,10 @@ def main():
     print("=" * 40)
     
     # Create matcher
-    matcher = CVJobMatcher(model=args.model)
+    matcher = CVJobMatcher(model=args.model, use_cache=not args.no_cache, semantic_cache=args.semantic_cache)
     
     # Run analysis
-    results = matcher.analyze_match(args.cv, args.job)
+    results = asyncio.run(matcher.analyze_match(args.cv, args.job))
     
     if results:
         print("\n" + "=" * 50)
@@ -358,6 +687,6 @@ if __name__ == "__main__":
         print("  python cv_job_matcher.py cv.docx job.txt --output report.md")
         print("\nSupported file formats: .txt, .pdf, .docx")
         print("Optional dependencies for file reading:")
-        print("  pip install PyPDF2 python-docx")
+        print("  pip install pypdfium2 python-docx")
     else:
         main()
\ No newline at end of file
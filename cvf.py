@@ -4,27 +4,172 @@ CV Format Checker - Test how well your CV can be read and parsed
 """
 
 import sys
+import os
 import re
+import mmap
+import stat
+from collections import Counter
+from functools import partial
 from pathlib import Path
 
-def read_file(file_path):
-    """Read file with multiple encoding attempts"""
-    encodings = ['utf-8', 'latin-1', 'cp1252']
-    
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Patterns are compiled once at import rather than on every analysis
+_SECTION_PATTERNS = {name: re.compile(pattern, re.IGNORECASE) for name, pattern in {
+    'Skills': r'(technical\s+)?skills?|competenc(ies|y)|technologies?',
+    'Experience': r'(work\s+|professional\s+)?experience|employment|career',
+    'Education': r'education|qualifications?|academic',
+    'Contact': r'contact|personal\s+info',
+    'Summary': r'summary|profile|objective',
+    'Projects': r'projects?|portfolio'
+}.items()}
+
+# Indicator patterns, grouped by the analysis list they feed
+_INDICATOR_PATTERNS = {
+    'skills_indicators': [
+        r'python|javascript|java|sql|html|css|react|angular|vue',
+        r'aws|azure|docker|kubernetes|git|linux',
+        r'machine learning|ai|data science|analytics',
+        r'project management|leadership|agile|scrum'
+    ],
+    'experience_indicators': [
+        r'\d+\+?\s+years?(?:\s+(?:of\s+)?experience)?',
+        r'(?:senior|junior|lead|principal|manager|director)',
+        r'\d{4}\s*[-–]\s*(?:\d{4}|present|current)',
+        r'(?:january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{4}'
+    ],
+    'education_indicators': [
+        r'(?:bachelor|master|phd|doctorate|degree)',
+        r'(?:university|college|institute|school)',
+        r'(?:bsc|msc|ba|ma|phd|mba)',
+        r'certified?|certification'
+    ]
+}
+
+# Contact details are scanned on their own, so indicator words such as
+# 'ma' or 'git' can't claim the start of an email address or profile link
+_CONTACT_PATTERNS = {
+    'contact_info': [
+        r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',  # Email
+        r'\+?\d{1,3}[-.\s]?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}',  # Phone
+        r'linkedin\.com/in/[\w-]+',  # LinkedIn
+        r'github\.com/[\w-]+'  # GitHub
+    ]
+}
+
+def _hyperscan_scan(database, buckets, text):
+    """Scan text with a compiled Hyperscan database"""
+    data = text.encode('utf-8')
+    hits = {}
+    
+    def on_match(pattern_id, start, end, flags, context):
+        # Hyperscan reports every end offset, keep the longest match per start
+        if hits.get((start, pattern_id), -1) < end:
+            hits[(start, pattern_id)] = end
+    
+    database.scan(data, match_event_handler=on_match)
+    
+    # Report like re.finditer: leftmost first, earlier patterns win ties, no overlaps
+    position = 0
+    for (start, pattern_id), end in sorted(hits.items()):
+        if start >= position:
+            position = end
+            yield buckets[pattern_id], data[start:end].decode('utf-8', errors='ignore')
+
+def _regex_scan(regex, group_buckets, text):
+    """Scan text with a fused Python regex"""
+    for match in regex.finditer(text):
+        yield group_buckets[match.lastgroup], match.group()
+
+def build_scanner(grouped_patterns, flags=re.IGNORECASE):
+    """Build a single-pass scanner yielding (bucket, matched_text), using Hyperscan when installed"""
+    buckets = []
+    patterns = []
+    for bucket, bucket_patterns in grouped_patterns.items():
+        for pattern in bucket_patterns:
+            buckets.append(bucket)
+            patterns.append(pattern)
+    
+    if hyperscan is not None:
+        hs_flags = hyperscan.HS_FLAG_SOM_LEFTMOST | hyperscan.HS_FLAG_UTF8
+        if flags & re.IGNORECASE:
+            hs_flags |= hyperscan.HS_FLAG_CASELESS
+        try:
+            database = hyperscan.Database()
+            database.compile(
+                expressions=[pattern.encode('utf-8') for pattern in patterns],
+                ids=list(range(len(patterns))),
+                elements=len(patterns),
+                flags=[hs_flags] * len(patterns)
+            )
+            return partial(_hyperscan_scan, database, buckets)
+        except Exception as e:
+            print(f"⚠️ Hyperscan could not compile patterns, using re: {e}")
+    
+    # Otherwise fuse the patterns into one alternation of named groups for re
+    group_buckets = {}
+    alternatives = []
+    for i, (bucket, pattern) in enumerate(zip(buckets, patterns)):
+        group_buckets[f"g{i}"] = bucket
+        alternatives.append(f"(?P<g{i}>{pattern})")
+    regex = re.compile('|'.join(alternatives), flags)
+    return partial(_regex_scan, regex, group_buckets)
+
+# Every indicator is found in a single pass over the CV and every contact
+# detail in a second one; each hit is tagged with the analysis list it belongs to
+_scan_indicators = build_scanner(_INDICATOR_PATTERNS)
+_scan_contacts = build_scanner(_CONTACT_PATTERNS)
+
+# Maps ASCII whitespace bytes to b' ' and every other byte to b'x', so words
+# can be counted as space-to-letter transitions without building a word list
+_WORD_MARKS = bytes(0x20 if byte in b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f' else 0x78 for byte in range(256))
+
+def count_words(text):
+    """Count whitespace-separated words without splitting the text"""
+    marks = text.encode('utf-8', errors='ignore').translate(_WORD_MARKS)
+    return marks.count(b' x') + marks.startswith(b'x')
+
+def _decode(data, encodings):
+    """Decode file bytes with the first encoding that works, as (text, encoding)"""
     for encoding in encodings:
         try:
-            with open(file_path, 'r', encoding=encoding) as f:
-                return f.read(), encoding
+            text = str(data, encoding)
         except UnicodeDecodeError:
             continue
+        
+        # Match text-mode reads, which translate \r\n and \r to \n
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return text, encoding
     
     raise Exception("Could not read file with any encoding")
 
+def read_file(file_path):
+    """Read file with multiple encoding attempts"""
+    encodings = ['utf-8', 'latin-1', 'cp1252']
+    
+    with open(file_path, 'rb') as f:
+        info = os.fstat(f.fileno())
+        
+        # Pipes and devices report size 0 and can't be mapped, so read them as a stream
+        if not stat.S_ISREG(info.st_mode):
+            return _decode(f.read(), encodings)
+        if info.st_size == 0:
+            return "", encodings[0]
+        
+        # Decode straight from a memory map, so there is no intermediate copy
+        # of the raw bytes and retries with another encoding don't re-read
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return _decode(data, encodings)
+
 def analyze_cv_structure(cv_text):
     """Analyze CV structure and content"""
     analysis = {
         'total_chars': len(cv_text),
-        'total_words': len(cv_text.split()),
+        'total_words': count_words(cv_text),
         'sections_found': [],
         'skills_indicators': [],
         'experience_indicators': [],
@@ -33,75 +178,21 @@ def analyze_cv_structure(cv_text):
         'potential_issues': []
     }
     
-    lines = cv_text.split('\n')
-    analysis['total_lines'] = len(lines)
+    analysis['total_lines'] = cv_text.count('\n') + 1
     
     # Look for common section headers
-    section_patterns = {
-        'Skills': r'(?i)(technical\s+)?skills?|competenc(ies|y)|technologies?',
-        'Experience': r'(?i)(work\s+|professional\s+)?experience|employment|career',
-        'Education': r'(?i)education|qualifications?|academic',
-        'Contact': r'(?i)contact|personal\s+info',
-        'Summary': r'(?i)summary|profile|objective',
-        'Projects': r'(?i)projects?|portfolio'
-    }
-    
-    for section, pattern in section_patterns.items():
-        matches = re.findall(pattern, cv_text)
-        if matches:
+    for section, pattern in _SECTION_PATTERNS.items():
+        if pattern.search(cv_text):
             analysis['sections_found'].append(section)
     
-    # Look for skills indicators
-    skill_patterns = [
-        r'python|javascript|java|sql|html|css|react|angular|vue',
-        r'aws|azure|docker|kubernetes|git|linux',
-        r'machine learning|ai|data science|analytics',
-        r'project management|leadership|agile|scrum'
-    ]
-    
-    for pattern in skill_patterns:
-        matches = re.findall(pattern, cv_text, re.IGNORECASE)
-        if matches:
-            analysis['skills_indicators'].extend(matches)
-    
-    # Remove duplicates
-    analysis['skills_indicators'] = list(set(analysis['skills_indicators']))
-    
-    # Look for experience indicators
-    exp_patterns = [
-        r'\d+\+?\s+years?(?:\s+(?:of\s+)?experience)?',
-        r'(?:senior|junior|lead|principal|manager|director)',
-        r'\d{4}\s*[-–]\s*(?:\d{4}|present|current)',
-        r'(?:january|february|march|april|may|june|july|august|september|october|november|december)\s+\d{4}'
-    ]
-    
-    for pattern in exp_patterns:
-        matches = re.findall(pattern, cv_text, re.IGNORECASE)
-        analysis['experience_indicators'].extend(matches)
-    
-    # Look for education indicators
-    edu_patterns = [
-        r'(?:bachelor|master|phd|doctorate|degree)',
-        r'(?:university|college|institute|school)',
-        r'(?:bsc|msc|ba|ma|phd|mba)',
-        r'certified?|certification'
-    ]
-    
-    for pattern in edu_patterns:
-        matches = re.findall(pattern, cv_text, re.IGNORECASE)
-        analysis['education_indicators'].extend(matches)
-    
-    # Look for contact info
-    contact_patterns = [
-        r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',  # Email
-        r'\+?\d{1,3}[-.\s]?\d{1,4}[-.\s]?\d{1,4}[-.\s]?\d{1,9}',  # Phone
-        r'linkedin\.com/in/[\w-]+',  # LinkedIn
-        r'github\.com/[\w-]+'  # GitHub
-    ]
+    # Look for skills, experience and education indicators, then contact info
+    for bucket, match in _scan_indicators(cv_text):
+        analysis[bucket].append(match)
+    for bucket, match in _scan_contacts(cv_text):
+        analysis[bucket].append(match)
     
-    for pattern in contact_patterns:
-        matches = re.findall(pattern, cv_text, re.IGNORECASE)
-        analysis['contact_info'].extend(matches)
+    # Remove duplicates, most frequently mentioned skills first
+    analysis['skills_indicators'] = [skill for skill, _ in Counter(analysis['skills_indicators']).most_common()]
     
     # Check for potential issues
     if analysis['total_chars'] < 500:
@@ -140,7 +231,7 @@ def display_analysis(analysis, filename):
     
     print(f"\n🔧 Skills Found:")
     if analysis['skills_indicators']:
-        for skill in analysis['skills_indicators'][:10]:  # Show first 10
+        for skill in analysis['skills_indicators'][:10]:  # Show top 10
             print(f"  ✅ {skill}")
         if len(analysis['skills_indicators']) > 10:
             print(f"  ... and {len(analysis['skills_indicators']) - 10} more")
@@ -1,31 +1,63 @@
 # Google BigQuery Python Access Examples
-# Install required packages: pip install google-cloud-bigquery pandas
+# Install required packages: pip install google-cloud-bigquery google-cloud-bigquery-storage pyarrow pandas
 
 from google.cloud import bigquery
+from google.cloud import bigquery_storage
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import functools
+import io
 import os
+from concurrent.futures import ThreadPoolExecutor
+import google.auth
 from google.oauth2 import service_account
 
+# Nullable and Arrow-backed dtypes for query results, so INT64, BOOL and
+# STRING columns don't fall back to object columns of Python values
+DATAFRAME_DTYPES = {
+    "bool_dtype": pd.BooleanDtype(),
+    "int_dtype": pd.Int64Dtype(),
+    "string_dtype": pd.StringDtype(storage="pyarrow"),
+}
+
+# Clients are created once per process and credentials source, so repeated
+# connect_* calls reuse the same HTTP/gRPC connections and credentials. Each
+# gets a BigQuery Storage read client made from the same credentials
+_read_clients = {}
+
+@functools.lru_cache(maxsize=None)
+def _client(key_path=None):
+    """Return a shared BigQuery client, optionally authenticated by a key file"""
+    if key_path:
+        credentials = service_account.Credentials.from_service_account_file(key_path)
+        project = credentials.project_id
+    else:
+        credentials, project = google.auth.default()
+    client = bigquery.Client(credentials=credentials, project=project)
+    _read_clients[client] = bigquery_storage.BigQueryReadClient(credentials=credentials)
+    return client
+
+def _read_client(client):
+    """Return the shared Storage read client for a client from _client, or None to let BigQuery make one"""
+    return _read_clients.get(client)
+
 # Method 1: Using Application Default Credentials (ADC)
 # Set up authentication by running: gcloud auth application-default login
 def connect_with_adc():
     """Connect using Application Default Credentials"""
-    client = bigquery.Client()
-    return client
+    return _client()
 
 # Method 2: Using Service Account Key File
 def connect_with_service_account(key_path):
     """Connect using service account JSON key file"""
-    credentials = service_account.Credentials.from_service_account_file(key_path)
-    client = bigquery.Client(credentials=credentials, project=credentials.project_id)
-    return client
+    return _client(key_path)
 
 # Method 3: Using Service Account Key from Environment Variable
 def connect_with_env_credentials():
     """Connect using service account key stored in environment variable"""
     # Set GOOGLE_APPLICATION_CREDENTIALS environment variable to path of your JSON key
-    client = bigquery.Client()
-    return client
+    return _client()
 
 # Basic query execution
 def run_query(client, query):
@@ -34,8 +66,9 @@ def run_query(client, query):
         # Run the query
         query_job = client.query(query)
         
-        # Convert results to pandas DataFrame
-        df = query_job.to_dataframe()
+        # Convert results to pandas DataFrame, downloading through the
+        # BigQuery Storage API (Arrow over gRPC) rather than paging JSON rows
+        df = query_job.to_dataframe(bqstorage_client=_read_client(client), **DATAFRAME_DTYPES)
         
         print(f"Query completed. Retrieved {len(df)} rows.")
         return df
@@ -44,6 +77,16 @@ def run_query(client, query):
         print(f"Error executing query: {e}")
         return None
 
+# Stream query results in batches
+def stream_query(client, query, batch_size=10_000):
+    """Execute a SQL query and return an iterator of Arrow record batches, one held in memory at a time"""
+    query_job = client.query(query)
+    
+    # batch_size is the REST page size, used only without the Storage API;
+    # Storage API batches are sized by the server
+    rows = query_job.result(page_size=batch_size)
+    return rows.to_arrow_iterable(bqstorage_client=_read_client(client))
+
 # Example queries
 def example_queries():
     """Example BigQuery SQL queries"""
@@ -101,19 +144,28 @@ def parameterized_query(client, start_date, end_date, state):
     )
     
     query_job = client.query(query, job_config=job_config)
-    return query_job.to_dataframe()
+    return query_job.to_dataframe(bqstorage_client=_read_client(client), **DATAFRAME_DTYPES)
 
 # Upload DataFrame to BigQuery
-def upload_dataframe_to_bq(client, df, table_id):
+def upload_dataframe_to_bq(client, df, table_id, compression="zstd"):
     """Upload a pandas DataFrame to BigQuery table"""
     
     job_config = bigquery.LoadJobConfig(
+        source_format=bigquery.SourceFormat.PARQUET,
         write_disposition="WRITE_TRUNCATE",  # Overwrite table
         # write_disposition="WRITE_APPEND",  # Append to table
     )
     
     try:
-        job = client.load_table_from_dataframe(df, table_id, job_config=job_config)
+        # Stage the DataFrame as compressed Parquet in memory and load that file,
+        # so we control the conversion and send far fewer bytes. Named index
+        # levels are uploaded as columns, as load_table_from_dataframe did
+        preserve_index = any(name is not None for name in df.index.names)
+        buffer = io.BytesIO()
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=preserve_index), buffer, compression=compression)
+        buffer.seek(0)
+        
+        job = client.load_table_from_file(buffer, table_id, job_config=job_config)
         job.result()  # Wait for job to complete
         
         print(f"Loaded {len(df)} rows into {table_id}")
@@ -122,19 +174,25 @@ def upload_dataframe_to_bq(client, df, table_id):
         print(f"Error uploading data: {e}")
 
 # List datasets and tables
-def explore_bigquery_resources(client):
+def explore_bigquery_resources(client, max_workers=16):
     """List available datasets and tables"""
     
     # List datasets
-    datasets = list(client.list_datasets())
+    datasets = list(client.list_datasets(page_size=1000))
     print("Available datasets:")
     for dataset in datasets:
         print(f"  - {dataset.dataset_id}")
     
-    # List tables in a specific dataset (replace with your dataset)
-    if datasets:
-        dataset_id = datasets[0].dataset_id
-        tables = list(client.list_tables(dataset_id))
+    # List tables in every dataset concurrently; list_tables is lazy, so the
+    # requests are made when each worker drains its iterator
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            dataset.dataset_id: executor.submit(list, client.list_tables(dataset, page_size=1000))
+            for dataset in datasets
+        }
+        tables_by_dataset = {dataset_id: future.result() for dataset_id, future in futures.items()}
+    
+    for dataset_id, tables in tables_by_dataset.items():
         print(f"\nTables in {dataset_id}:")
         for table in tables:
             print(f"  - {table.table_id}")
@@ -159,6 +217,11 @@ def main():
     if df_public is not None:
         print(df_public.head())
     
+    # For result sets too large for one DataFrame, stream Arrow batches
+    # instead of calling run_query (each call runs, and bills, the query):
+    # for batch in stream_query(client, public_query):
+    #     print(f"Got {batch.num_rows} rows")
+    
     # Execute parameterized query
     print("\nRunning parameterized query...")
     df_param = parameterized_query(client, 2010, 2013, 'NY')
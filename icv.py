@@ -6,21 +6,54 @@ Uses the same reliable approach as cv_job_matcher.py
 
 import os
 import sys
+import argparse
+import asyncio
+import bisect
+import hashlib
+import json
+from datetime import datetime
 from pathlib import Path
-import tempfile
+from contextlib import ExitStack, contextmanager
 
-# Import the working CV matcher
-try:
-    from cv_job_matcher import CVJobMatcher
-except ImportError:
-    print("❌ Make sure cv_job_matcher.py is in the same directory")
-    sys.exit(1)
+# Queued analyses are dispatched automatically once this many are waiting
+BATCH_SIZE = 8
 
-def get_file_path(prompt_text):
+# Finished analyses are cached per (CV, job description, model); bump the
+# version whenever the shape of the results changes to invalidate old entries
+RESULT_CACHE_DIR = Path.home() / ".icv_cache"
+RESULT_CACHE_VERSION = 2
+
+# Embeddings of analyzed job descriptions, so a reworded or reformatted
+# job description for the same CV can reuse the earlier analysis. Only used
+# with --semantic-cache; the threshold is the matcher's SEMANTIC_THRESHOLD, as
+# postings for similar roles at different companies can score above 0.9
+JD_INDEX_FILE = RESULT_CACHE_DIR / "jd_index.npy"
+JD_INDEX_ROWS = RESULT_CACHE_DIR / "jd_index.json"
+JD_SIMILARITY_THRESHOLD = 0.97
+
+# Score interpretation: bisecting the thresholds picks the message
+_TIER_THRESHOLDS = [40, 60, 80]
+_TIER_MESSAGES = [
+    "🔴 Limited match. Significant skill development needed.",
+    "🟠 Moderate match. Consider addressing key gaps.",
+    "🟡 Good match with some areas for improvement.",
+    "🟢 Excellent match! You're well-qualified for this role.",
+]
+
+# Visual score bar for every score from 0 to 100, 20 bars total
+_BARS = ["█" * (score // 5) + "░" * (20 - score // 5) for score in range(101)]
+
+def get_file_path(prompt_text, default=None):
     """Get a valid file path from user"""
+    if default:
+        prompt_text += f" (Enter for {Path(default).name})"
+    
     while True:
         file_path = input(f"\n{prompt_text}: ").strip().strip('"\'')
         
+        if not file_path and default:
+            return default
+        
         if not file_path:
             print("Please enter a file path.")
             continue
@@ -30,21 +63,25 @@ def get_file_path(prompt_text):
         else:
             print(f"❌ File not found: {file_path}")
             
-            # Show current directory files as help
-            current_dir = Path.cwd()
+            # Show current directory files as help, stopping once we know there are more than 10
             print(f"\n📁 Files in current directory:")
-            files = [f for f in current_dir.iterdir() if f.is_file()]
-            for file in files[:10]:  # Show first 10 files
-                print(f"  - {file.name}")
+            files = []
+            with os.scandir(Path.cwd()) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        files.append(entry.name)
+                        if len(files) > 10:
+                            break
+            for name in files[:10]:  # Show first 10 files
+                print(f"  - {name}")
             if len(files) > 10:
-                print(f"  ... and {len(files) - 10} more files")
+                print("  ... and more files")
 
-def get_model_choice():
+def get_model_choice(client):
     """Let user choose a model"""
     # Try to get available models
     try:
-        import ollama
-        models_response = ollama.list()
+        models_response = client.list()
         available = [model['name'] for model in models_response['models']]
         
         print(f"\n🤖 Available Models:")
@@ -70,8 +107,9 @@ def get_model_choice():
         print(f"⚠️ Could not list models: {e}")
         return "phi"  # Default fallback
 
-def get_job_description():
-    """Get job description - either from file or text input"""
+@contextmanager
+def job_description_source():
+    """Get job description - either from file or text input - as (path, kind)"""
     print(f"\n💼 Job Description Options:")
     print("1. Upload a file")
     print("2. Paste job description text")
@@ -80,7 +118,8 @@ def get_job_description():
         choice = input("Choose option (1 or 2): ").strip()
         
         if choice == "1":
-            return get_file_path("📄 Enter job description file path"), "file"
+            yield get_file_path("📄 Enter job description file path"), "file"
+            return
         elif choice == "2":
             print("\n📝 Paste your job description (press Ctrl+D when done on Linux/Mac, Ctrl+Z on Windows):")
             lines = []
@@ -93,82 +132,269 @@ def get_job_description():
             
             job_text = '\n'.join(lines).strip()
             if job_text:
-                # Create temporary file
-                temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False)
-                temp_file.write(job_text)
-                temp_file.close()
-                return temp_file.name, "temp"
+                import tempfile
+                
+                # Written to a temporary directory that is removed when the context exits,
+                # rather than a self-deleting file, which Windows won't let us reopen
+                with tempfile.TemporaryDirectory() as temp_dir:
+                    temp_path = os.path.join(temp_dir, "job_description.txt")
+                    with open(temp_path, 'w') as f:
+                        f.write(job_text)
+                    yield temp_path, "temp"
+                return
             else:
                 print("No job description entered. Please try again.")
         else:
             print("Please enter 1 or 2.")
 
+def result_cache_key(matcher, cv_file, job_file):
+    """Hash the CV and job description contents together with the model name, or None if either can't be read"""
+    digest = hashlib.sha256()
+    for path in (cv_file, job_file):
+        try:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        except OSError:
+            return None
+        digest.update(b"\0")
+    digest.update(matcher.model.encode())
+    return digest.hexdigest()
+
+def load_cached_result(matcher, key):
+    """Return a cached analysis for this key, or None"""
+    try:
+        with open(RESULT_CACHE_DIR / f"{key}.json", 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    if entry.get('version') != RESULT_CACHE_VERSION or entry.get('model') != matcher.model:
+        return None
+    return entry.get('results')
+
+def store_cached_result(matcher, key, results):
+    """Save an analysis to the result cache"""
+    entry = {
+        'version': RESULT_CACHE_VERSION,
+        'model': matcher.model,
+        'timestamp': datetime.now().isoformat(),
+        'results': results
+    }
+    try:
+        RESULT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(RESULT_CACHE_DIR / f"{key}.json", 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+    except OSError as e:
+        print(f"⚠️ Could not cache results: {e}")
+
+def file_hash(path):
+    """Hash a file's contents, or None if it can't be read"""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+def load_jd_index():
+    """Load the job description index as (vectors, rows)"""
+    import numpy as np
+    
+    try:
+        vectors = np.load(JD_INDEX_FILE)
+        with open(JD_INDEX_ROWS, 'r', encoding='utf-8') as f:
+            rows = json.load(f)
+        if len(rows) == len(vectors):
+            return vectors, rows
+    except (OSError, ValueError):
+        pass
+    return None, []
+
+def save_jd_index(vectors, rows):
+    """Save the job description index"""
+    import numpy as np
+    
+    try:
+        RESULT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        np.save(JD_INDEX_FILE, vectors)
+        with open(JD_INDEX_ROWS, 'w', encoding='utf-8') as f:
+            json.dump(rows, f)
+    except OSError as e:
+        print(f"⚠️ Could not save job description index: {e}")
+
+async def embed_job_description(matcher, job_file):
+    """Return the unit-length embedding of a normalized job description, or None"""
+    import numpy as np
+    from cv_job_matcher import EMBED_MODEL, KEEP_ALIVE
+    
+    try:
+        text = " ".join(matcher.read_file(job_file).split()).lower()
+        response = await matcher.aclient.embeddings(model=EMBED_MODEL, prompt=text, keep_alive=KEEP_ALIVE)
+    except Exception:
+        return None
+    vector = np.asarray(response['embedding'], dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+def find_similar_result(matcher, vectors, rows, cv_hash, vector):
+    """Return (results, similarity) for the closest cached job description for this CV, or None"""
+    import numpy as np
+    
+    if vectors is None or vectors.shape[1] != vector.shape[0]:
+        return None
+    
+    candidates = [i for i, row in enumerate(rows) if row['cv_hash'] == cv_hash and row['model'] == matcher.model]
+    if not candidates:
+        return None
+    
+    similarities = vectors[candidates] @ vector
+    best = int(np.argmax(similarities))
+    if similarities[best] < JD_SIMILARITY_THRESHOLD:
+        return None
+    
+    results = load_cached_result(matcher, rows[candidates[best]]['key'])
+    return (results, float(similarities[best])) if results is not None else None
+
+def parsed_cv_texts(matcher, cv_files, parsed_cvs):
+    """Return {cv_file: text}, parsing each CV only if it changed since it was last read"""
+    texts = {}
+    for cv_file in set(cv_files):
+        try:
+            stat = os.stat(cv_file)
+            key = (cv_file, stat.st_mtime_ns, stat.st_size)
+            if key not in parsed_cvs:
+                parsed_cvs[key] = matcher.read_file(cv_file)
+        except Exception:
+            continue  # left to the matcher, which reports the error
+        texts[cv_file] = parsed_cvs[key]
+    return texts
+
+async def cached_analyze(matcher, pairs, parsed_cvs=None):
+    """Analyze (cv_file, job_file) pairs, reusing cached results for repeats"""
+    from cv_job_matcher import EMBED_MODEL
+    
+    # Exact contents first; pairs whose files can't be read have no key and
+    # go straight to the matcher, which reports the error
+    keys = [result_cache_key(matcher, cv_file, job_file) for cv_file, job_file in pairs]
+    results = [load_cached_result(matcher, key) if key else None for key in keys]
+    
+    misses = [i for i, cached in enumerate(results) if cached is None]
+    if len(misses) < len(pairs):
+        print(f"♻️  Reusing {len(pairs) - len(misses)} earlier analysis(es)")
+    
+    # Near-identical job descriptions for the same CV; the matcher only turns
+    # its semantic cache on when numpy is installed
+    embeddings = {}
+    readable = [i for i in misses if keys[i] is not None]
+    if readable and matcher.semantic_cache:
+        import numpy as np
+        
+        vectors, rows = load_jd_index()
+        embedded = await asyncio.gather(*(embed_job_description(matcher, pairs[i][1]) for i in readable))
+        if all(vector is None for vector in embedded):
+            # Most likely the embedding model isn't pulled; don't retry on every batch
+            print(f"⚠️ Could not embed job descriptions with {EMBED_MODEL}, semantic cache disabled")
+            matcher.semantic_cache = False
+        elif any(vector is None for vector in embedded):
+            print(f"⚠️ Could not embed some job descriptions with {EMBED_MODEL}, skipping similarity lookup for them")
+        
+        for i, vector in zip(readable, embedded):
+            cv_hash = file_hash(pairs[i][0])
+            if vector is None or cv_hash is None:
+                continue
+            embeddings[i] = (cv_hash, vector)
+            
+            similar = find_similar_result(matcher, vectors, rows, cv_hash, vector)
+            if similar is not None:
+                results[i], similarity = similar
+                misses.remove(i)
+                print(f"♻️  Reusing the analysis of a near-identical job description (similarity {similarity:.2f})")
+    
+    if misses:
+        # Parsed through the session's parsed_cvs, so a CV isn't re-read for every job description
+        cv_texts = parsed_cv_texts(matcher, [pairs[i][0] for i in misses], {} if parsed_cvs is None else parsed_cvs)
+        fresh = await matcher.analyze_pairs([pairs[i] for i in misses], cv_texts=cv_texts)
+        indexed = False
+        for i, analysis in zip(misses, fresh):
+            results[i] = analysis
+            if keys[i] is None or not analysis or analysis.get('failed'):
+                continue  # incomplete analyses are retried next time rather than cached
+            
+            store_cached_result(matcher, keys[i], analysis)
+            if i in embeddings:
+                cv_hash, vector = embeddings[i]
+                if vectors is None or vectors.shape[1] != vector.shape[0]:
+                    vectors, rows = vector[np.newaxis, :], []
+                else:
+                    vectors = np.vstack([vectors, vector])
+                rows.append({'cv_hash': cv_hash, 'model': matcher.model, 'key': keys[i]})
+                indexed = True
+        
+        if indexed:
+            save_jd_index(vectors, rows)
+    
+    return results
+
 def display_results_nicely(results):
     """Display results in a user-friendly format"""
     if not results:
         print("❌ No results to display")
         return
     
+    # Built up and written in one go rather than line by line
+    out = []
+    
     match_analysis = results.get('match_analysis', {})
     score = match_analysis.get('overall_score', 0)
     
-    print("\n" + "="*70)
-    print("🎯 CV-JOB ANALYSIS RESULTS")
-    print("="*70)
+    out.append("\n" + "="*70)
+    out.append("🎯 CV-JOB ANALYSIS RESULTS")
+    out.append("="*70)
     
     # Score display
-    print(f"\n📊 Overall Match Score: {score}/100")
+    out.append(f"\n📊 Overall Match Score: {score}/100")
     
     # Visual score bar
-    filled_bars = int(score / 5)  # 20 bars total
-    empty_bars = 20 - filled_bars
-    score_bar = "█" * filled_bars + "░" * empty_bars
-    print(f"     [{score_bar}] {score}%")
+    score_bar = _BARS[min(max(int(score), 0), 100)]
+    out.append(f"     [{score_bar}] {score}%")
     
     # Score interpretation
-    if score >= 80:
-        print("🟢 Excellent match! You're well-qualified for this role.")
-    elif score >= 60:
-        print("🟡 Good match with some areas for improvement.")
-    elif score >= 40:
-        print("🟠 Moderate match. Consider addressing key gaps.")
-    else:
-        print("🔴 Limited match. Significant skill development needed.")
+    out.append(_TIER_MESSAGES[bisect.bisect_right(_TIER_THRESHOLDS, score)])
     
     # Detailed sections
     sections = results.get('sections', {})
     if sections.get('cv_skills'):
-        print(f"\n🔧 Your Key Skills:")
+        out.append(f"\n🔧 Your Key Skills:")
         for skill in sections['cv_skills'][:8]:  # Top 8
-            print(f"  ✓ {skill}")
+            out.append(f"  ✓ {skill}")
     
     if sections.get('job_requirements'):
-        print(f"\n📋 Job Requirements:")
+        out.append(f"\n📋 Job Requirements:")
         for req in sections['job_requirements'][:8]:  # Top 8
-            print(f"  • {req}")
+            out.append(f"  • {req}")
     
     # Analysis
     detailed_analysis = match_analysis.get('detailed_analysis', '')
     if detailed_analysis:
-        print(f"\n📝 Detailed Analysis:")
-        print("-" * 50)
-        print(detailed_analysis)
+        out.append(f"\n📝 Detailed Analysis:")
+        out.append("-" * 50)
+        out.append(detailed_analysis)
     
     # Cover letter suggestions
     cover_suggestions = results.get('cover_letter_suggestions', '')
     if cover_suggestions:
-        print(f"\n💡 Cover Letter Talking Points:")
-        print("-" * 50)
-        print(cover_suggestions)
+        out.append(f"\n💡 Cover Letter Talking Points:")
+        out.append("-" * 50)
+        out.append(cover_suggestions)
     
     # Skill gaps
     skill_gaps = results.get('skill_gaps', '')
     if skill_gaps:
-        print(f"\n⚠️ Areas for Improvement:")
-        print("-" * 50)
-        print(skill_gaps)
+        out.append(f"\n⚠️ Areas for Improvement:")
+        out.append("-" * 50)
+        out.append(skill_gaps)
+    
+    out.append("\n" + "="*70)
     
-    print("\n" + "="*70)
+    sys.stdout.write("\n".join(out) + "\n")
 
 def save_results_option(matcher, results):
     """Offer to save results"""
@@ -182,7 +408,6 @@ def save_results_option(matcher, results):
         
         choice = input("Choose option (1-3): ").strip()
         
-        from datetime import datetime
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         if choice in ['1', '3']:
@@ -195,36 +420,75 @@ def save_results_option(matcher, results):
             matcher.save_results(json_file)
 
 def main():
+    parser = argparse.ArgumentParser(description="Interactively analyze CVs against job descriptions using Ollama")
+    parser.add_argument("--semantic-cache", action="store_true",
+                        help="Also reuse analyses for near-identical job descriptions and prompts (needs numpy and an Ollama embedding model)")
+    args = parser.parse_args()
+    
     print("🤖 Interactive CV-Job Matcher")
     print("=" * 50)
     print("This tool analyzes how well your CV matches a job description using AI.")
     
+    # Imported here so the banner shows before Ollama's HTTP stack loads
     try:
+        import ollama
+        from cv_job_matcher import CVJobMatcher
+    except ImportError:
+        print("❌ Make sure cv_job_matcher.py is in the same directory")
+        sys.exit(1)
+    
+    loop = None
+    try:
+        # One Ollama client for the whole session, shared with the matcher
+        client = ollama.Client()
+        
         # Get model choice
-        model = get_model_choice()
+        model = get_model_choice(client)
         print(f"\n🔧 Using model: {model}")
         
         # Create matcher
-        matcher = CVJobMatcher(model=model)
+        matcher = CVJobMatcher(model=model, client=client, semantic_cache=args.semantic_cache)
         
+        # One event loop for the whole session so the matcher's async
+        # Ollama client keeps its connections between analyses
+        loop = asyncio.new_event_loop()
+        
+        cv_file = None
+        parsed_cvs = {}  # (path, mtime_ns, size) -> parsed CV text
         while True:
             print("\n" + "=" * 50)
             
-            # Get CV file
-            cv_file = get_file_path("📄 Enter path to your CV file")
-            
-            # Get job description
-            job_source, job_type = get_job_description()
-            temp_files = []
-            if job_type == "temp":
-                temp_files.append(job_source)
+            pending = []  # (cv_file, job_source) pairs waiting to be analyzed
+            labels = []
             
-            try:
-                print(f"\n🔍 Analyzing CV against job description...")
+            # Pasted job descriptions stay on disk until the batch is done
+            with ExitStack() as job_sources:
+                # Queue CV/job pairs until the user runs the batch or it is full
+                while True:
+                    cv_file = get_file_path("📄 Enter path to your CV file", default=cv_file)
+                    
+                    job_source, job_type = job_sources.enter_context(job_description_source())
+                    
+                    pending.append((cv_file, job_source))
+                    labels.append(f"{Path(cv_file).name} vs {'pasted job description' if job_type == 'temp' else Path(job_source).name}")
+                    
+                    if len(pending) >= BATCH_SIZE:
+                        print(f"\n📦 {BATCH_SIZE} jobs queued, starting analysis")
+                        break
+                    
+                    choice = input(f"\n▶️  Analyze now, or queue another job? ({len(pending)} queued) (a/q): ").strip().lower()
+                    if choice not in ['q', 'queue']:
+                        break
+                
+                print(f"\n🔍 Analyzing {len(pending)} CV/job pair(s)...")
                 print("This may take 30-60 seconds...")
                 
-                # Run analysis
-                results = matcher.analyze_match(cv_file, job_source)
+                # Run all queued analyses as one batch
+                batch_results = loop.run_until_complete(cached_analyze(matcher, pending, parsed_cvs))
+            
+            for i, (label, results) in enumerate(zip(labels, batch_results), 1):
+                if len(pending) > 1:
+                    print(f"\n📌 Result {i} of {len(pending)}: {label}")
                 
                 if results:
                     # Display results
@@ -234,14 +498,6 @@ def main():
                     save_results_option(matcher, results)
                 else:
                     print("❌ Analysis failed. Please check your files and try again.")
-                
-            finally:
-                # Clean up temp files
-                for temp_file in temp_files:
-                    try:
-                        os.unlink(temp_file)
-                    except:
-                        pass
             
             # Ask about another analysis
             another = input(f"\n🔄 Would you like to analyze another job? (y/n): ").strip().lower()
@@ -255,6 +511,9 @@ def main():
     except Exception as e:
         print(f"\n❌ Error: {e}")
         print("Make sure Ollama is running and cv_job_matcher.py is in the same directory.")
+    finally:
+        if loop is not None:
+            loop.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
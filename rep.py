@@ -1,72 +1,87 @@
+import copy
 import re
+from functools import lru_cache
+from typing import Iterable, TextIO, Union
 
-def analyze_cv(cv_text: str) -> dict:
+from cvf import build_scanner
+
+_SKILLS = ['Python', 'SQL', 'Kubernetes', 'Project Management', 'Data Analysis']
+
+# Every indicator pattern as a named group: group name -> (bucket, pattern).
+# Email and phone have no letters to fold, so only word patterns are caseless
+ALL_PATTERNS = {
+    'email': ('contact_info', r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}'),
+    'phone': ('contact_info', r'(?:\+|\b)\d{1,3}[\s\-]?\(?\d{2,4}\)?[\s\-]?\d{3,4}[\s\-]?\d{3,4}\b'),
+    'edu_bsc': ('education_indicators', r'(?i:\bBSc\b)'),
+    'edu_msc': ('education_indicators', r'(?i:\bMSc\b)'),
+    'edu_phd': ('education_indicators', r'(?i:\bPhD\b)'),
+    'edu_university': ('education_indicators', r'(?i:University)'),
+    'edu_college': ('education_indicators', r'(?i:College)'),
+    'exp_manager': ('experience_indicators', r'(?i:\bManager\b)'),
+    'exp_engineer': ('experience_indicators', r'(?i:\bEngineer\b)'),
+    'exp_experience': ('experience_indicators', r'(?i:\bExperience\b)'),
+    'exp_employment': ('experience_indicators', r'(?i:\bEmployment\b)'),
+    **{f'skill_{i}': ('skills_indicators', rf'(?i:\b{re.escape(skill)}\b)') for i, skill in enumerate(_SKILLS)},
+}
+GROUP_TO_BUCKET = {name: bucket for name, (bucket, _) in ALL_PATTERNS.items()}
+_SKILL_GROUPS = {f'skill_{i}': skill for i, skill in enumerate(_SKILLS)}
+
+# One scan over all indicators: Hyperscan when installed, otherwise a fused re
+_SCANNER = build_scanner({name: [pattern] for name, (_, pattern) in ALL_PATTERNS.items()}, flags=0)
+
+# Section headers must fill the whole line, so each one is looked up by its
+# lowercased, whitespace-normalised text instead of trying every regex
+_SECTION_HEADERS = {header: name for name, headers in {
+    'Experience': ['experience', 'work experience', 'professional experience', 'employment', 'career'],
+    'Education': ['education', 'qualifications', 'study'],
+    'Skills': ['skill', 'skills', 'technologies', 'competencies'],
+}.items() for header in headers}
+
+def _analyze_lines(lines: Iterable[str]) -> dict:
     analysis = {
-        'total_chars': len(cv_text),
-        'total_words': len(cv_text.split()),
+        'total_chars': 0,
+        'total_words': 0,
         'sections_found': [],
         'sections_content': {},       # NEW: full text per section
-        'skills_indicators': [],
-        'experience_indicators': [],
-        'education_indicators': [],
-        'contact_info': [],
+        'skills_indicators': set(),
+        'experience_indicators': set(),
+        'education_indicators': set(),
+        'contact_info': set(),
         'potential_issues': []
     }
 
-    # --- Define section headers and regex patterns ---
-    section_patterns = {
-        'Experience': r'(?i)(work\s+|professional\s+)?experience|employment|career',
-        'Education': r'(?i)education|qualifications|study',
-        'Skills': r'(?i)skills?|technologies|competencies',
-    }
-
-    # --- Extract full sections ---
-    # Idea: split text by lines and group lines under section headers
-    lines = cv_text.splitlines()
+    # --- Stream the CV once: counts, sections and indicators per line ---
     current_section = None
     for line in lines:
+        analysis['total_chars'] += len(line)
+        analysis['total_words'] += len(line.split())
+
+        for group, text in _SCANNER(line):
+            # Skills keep their canonical name, other hits are case-folded so repeats collapse
+            if group in _SKILL_GROUPS:
+                analysis['skills_indicators'].add(_SKILL_GROUPS[group])
+            else:
+                analysis[GROUP_TO_BUCKET[group]].add(text.strip().lower())
+
         stripped = line.strip()
         if not stripped:
             continue
 
         # Check if line matches a section header
-        for section, pattern in section_patterns.items():
-            if re.fullmatch(pattern, stripped, flags=re.IGNORECASE):
-                current_section = section
-                analysis['sections_found'].append(section)
-                analysis['sections_content'][section] = []
-                break
-        else:
+        section = _SECTION_HEADERS.get(" ".join(stripped.lower().split()))
+        if section:
+            current_section = section
+            analysis['sections_found'].append(section)
+            analysis['sections_content'][section] = []
+        elif current_section:
             # If we are inside a section, keep collecting lines
-            if current_section:
-                analysis['sections_content'][current_section].append(stripped)
+            analysis['sections_content'][current_section].append(stripped)
 
     # Convert collected section lines into strings
     for section in analysis['sections_content']:
         analysis['sections_content'][section] = "\n".join(analysis['sections_content'][section])
-
-    # --- Extract contact info ---
-    emails = re.findall(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}', cv_text)
-    phones = re.findall(r'\+?\d[\d\s-]{7,}', cv_text)
-    analysis['contact_info'].extend(emails + phones)
-
-    # --- Education indicators ---
-    edu_patterns = [r'\bBSc\b', r'\bMSc\b', r'\bPhD\b', r'University', r'College']
-    for pat in edu_patterns:
-        matches = re.findall(pat, cv_text, flags=re.IGNORECASE)
-        analysis['education_indicators'].extend(matches)
-
-    # --- Experience indicators ---
-    exp_patterns = [r'\bManager\b', r'\bEngineer\b', r'\bExperience\b', r'\bEmployment\b']
-    for pat in exp_patterns:
-        matches = re.findall(pat, cv_text, flags=re.IGNORECASE)
-        analysis['experience_indicators'].extend(matches)
-
-    # --- Skills indicators ---
-    skills_list = ['Python', 'SQL', 'Kubernetes', 'Project Management', 'Data Analysis']
-    for skill in skills_list:
-        if re.search(rf'\b{skill}\b', cv_text, flags=re.IGNORECASE):
-            analysis['skills_indicators'].append(skill)
+    for key in ('skills_indicators', 'experience_indicators', 'education_indicators', 'contact_info'):
+        analysis[key] = sorted(analysis[key])
 
     # --- Potential issues ---
     if 'Experience' not in analysis['sections_found']:
@@ -78,6 +93,18 @@ def analyze_cv(cv_text: str) -> dict:
 
     return analysis
 
+@lru_cache(maxsize=128)
+def _analyze_cv_text(cv_text: str) -> dict:
+    # splitlines also breaks on \r and other line boundaries, which StringIO doesn't
+    return _analyze_lines(cv_text.splitlines(keepends=True))
+
+def analyze_cv(cv_text: Union[str, TextIO]) -> dict:
+    # Accepts the text itself or an open text file; text results are memoised,
+    # since the same CV is usually checked again and again
+    if isinstance(cv_text, str):
+        return copy.deepcopy(_analyze_cv_text(cv_text))
+    return _analyze_lines(cv_text)
+
     for edu in analysis['education_indicators'][:5]:  # Show first 5
         print(f"  ✅ {edu}")
     if len(analysis['education_indicators']) > 5:
@@ -5,7 +5,7 @@ echo "=" * 30
 
 # Install optional dependencies
 echo "📦 Installing optional dependencies..."
-pip install PyPDF2 python-docx
+pip install pypdfium2 python-docx
 
 # Create example files directory
 mkdir -p examples